@@ -1,10 +1,20 @@
 import pandas as pd
 import numpy as np
-import re
+import pyarrow as pa
+from pyarrow import csv as pacsv
+from pyarrow import feather
+import pyarrow.compute as pc
+import argparse
+import csv
 import json
 import logging
 from pathlib import Path
-from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+
+# Copy-on-Write lets derived frames share column data until one is modified
+# (always on from pandas 3.0, where the option is deprecated).
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.options.mode.copy_on_write = True
 
 # ----------------------------------------------------------------------
 # Logging config
@@ -32,31 +42,99 @@ for d in [RAW_DIR, BRONZE_DIR, SILVER_DIR, REPORT_DIR, DQ_REPORT_DIR]:
 MAIN_CSV_PATH = RAW_DIR / "diabetic_data.csv"
 LOOKUP_CSV_PATH = RAW_DIR / "ids_mapping.csv"
 
+# Arrow-backed strings: .str ops run as pyarrow compute kernels
+STRING_DTYPE = pd.StringDtype("pyarrow")
+
+# Fixed schema of diabetic_data.csv
+ID_COLS = (
+    "encounter_id",
+    "patient_nbr",
+    "admission_type_id",
+    "discharge_disposition_id",
+    "admission_source_id",
+)
+NUMERIC_COLS = (
+    "time_in_hospital",
+    "num_lab_procedures",
+    "num_procedures",
+    "num_medications",
+    "number_outpatient",
+    "number_emergency",
+    "number_inpatient",
+    "number_diagnoses",
+)
+DIAG_COLS = ("diag_1", "diag_2", "diag_3")
+LAB_COLS = ("A1Cresult", "max_glu_serum")
+MED_COLS = (
+    "metformin", "repaglinide", "nateglinide", "chlorpropamide",
+    "glimepiride", "acetohexamide", "glipizide", "glyburide",
+    "tolbutamide", "pioglitazone", "rosiglitazone", "acarbose",
+    "miglitol", "troglitazone", "tolazamide", "examide",
+    "citoglipton", "insulin", "glyburide-metformin",
+    "glipizide-metformin", "glimepiride-pioglitazone",
+    "metformin-rosiglitazone", "metformin-pioglitazone",
+)
+EXPECTED_COLUMNS = frozenset(
+    ID_COLS + NUMERIC_COLS + DIAG_COLS + LAB_COLS + MED_COLS
+    + (
+        "race", "gender", "age", "weight", "payer_code", "medical_specialty",
+        "change", "diabetesMed", "readmitted",
+    )
+)
+
+# pandas' default NA markers plus the dataset's "?" placeholder
+NA_VALUES = [
+    "", "?", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+]
+
 
 # ----------------------------------------------------------------------
 # Ingestion
 # ----------------------------------------------------------------------
-def count_data_lines(path, encoding="utf-8"):
-    """Count number of *data* lines (excluding header)."""
-    with open(path, "r", encoding=encoding) as f:
-        return sum(1 for _ in f) - 1
+def to_low_cardinality_categories(df, max_unique=50):
+    """Store repetitive string columns (race, gender, meds, ...) as categoricals."""
+    low_card_cols = [c for c in df.columns if df[c].nunique(dropna=True) < max_unique]
+    df[low_card_cols] = df[low_card_cols].astype("category")
+    return df
 
 
 def ingest_main_encounters(path, encoding="utf-8"):
     logging.info(f"Starting ingestion of main CSV from {path}")
-    total_lines = count_data_lines(path, encoding=encoding)
-    logging.info(f"Total lines in raw file (excluding header): {total_lines}")
 
-    df = pd.read_csv(
+    with open(path, "r", encoding=encoding, newline="") as f:
+        header = next(csv.reader(f))
+
+    missing_cols = EXPECTED_COLUMNS.difference(header)
+    if missing_cols:
+        raise ValueError(f"{path} is missing expected columns: {sorted(missing_cols)}")
+
+    # count malformed rows while parsing instead of re-reading the file
+    rejected_rows = []
+
+    def skip_invalid_row(row):
+        rejected_rows.append(row.number)
+        return "skip"
+
+    table = pacsv.read_csv(
         path,
-        dtype=str,  # keep everything as string first
-        na_values=["?", "NA", "NaN", "null"],
-        on_bad_lines="skip",
-        encoding=encoding,
+        read_options=pacsv.ReadOptions(block_size=1 << 24, encoding=encoding),
+        parse_options=pacsv.ParseOptions(invalid_row_handler=skip_invalid_row),
+        convert_options=pacsv.ConvertOptions(
+            null_values=NA_VALUES,
+            strings_can_be_null=True,
+            # keep everything as string first
+            column_types={c: pa.string() for c in header},
+        ),
     )
+    df = table.to_pandas(types_mapper={pa.string(): STRING_DTYPE}.get)
+    df = to_low_cardinality_categories(df)
 
     rows_loaded, cols_loaded = df.shape
-    rows_rejected = max(total_lines - rows_loaded, 0)
+    rows_rejected = len(rejected_rows)
+    total_lines = rows_loaded + rows_rejected
+    logging.info(f"Total lines in raw file (excluding header): {total_lines}")
 
     ingestion_summary = {
         "file": str(path),
@@ -84,30 +162,25 @@ def parse_lookup_blocks(path, encoding="utf-8"):
     - discharge_disposition_df
     - admission_source_df
     """
-    with open(path, "r", encoding=encoding) as f:
-        text = f.read()
-
-    # Split on lines that are just "," or blank
-    blocks = []
-    current = []
-    for line in text.splitlines():
-        if line.strip() in {"", ","}:
-            if current:
-                blocks.append("\n".join(current))
-                current = []
-        else:
-            current.append(line)
-    if current:
-        blocks.append("\n".join(current))
-
-    if len(blocks) != 3:
-        logging.warning("Expected 3 blocks in lookup file, found %s", len(blocks))
+    raw = pd.read_csv(
+        path, header=None, skip_blank_lines=False, dtype=str, encoding=encoding
+    )
+
+    # Blocks are separated by lines that are just "," or blank
+    first_col = raw.iloc[:, 0].str.strip()
+    is_sep = first_col.isna() | first_col.eq("")
+    block_id = is_sep.cumsum()
 
     dfs = []
-    for block in blocks:
-        df_block = pd.read_csv(StringIO(block), dtype=str)
+    for _, block in raw[~is_sep].groupby(block_id[~is_sep], sort=True):
+        # first row of each block is its header
+        df_block = block.iloc[1:].reset_index(drop=True)
+        df_block.columns = block.iloc[0].tolist()
         dfs.append(df_block)
 
+    if len(dfs) != 3:
+        logging.warning("Expected 3 blocks in lookup file, found %s", len(dfs))
+
     admission_type_df, discharge_disp_df, admission_source_df = dfs
 
     # Just in case: use consistent column names
@@ -130,16 +203,26 @@ def parse_lookup_blocks(path, encoding="utf-8"):
 def validate_missing_and_duplicates(df):
     n_rows, n_cols = df.shape
 
-    missing = df.isna().sum().reset_index()
-    missing.columns = ["column", "missing_count"]
+    # per-column null counts (Arrow validity bitmaps / category codes),
+    # without materializing a full boolean frame
+    missing = pd.DataFrame({
+        "column": df.columns,
+        "missing_count": [int(df[c].isna().sum()) for c in df.columns],
+    })
     missing["missing_pct"] = missing["missing_count"] / n_rows
 
-    dup_all_rows = int(df.duplicated().sum())
     if "encounter_id" in df.columns:
-        dup_encounters = int(df.duplicated(subset=["encounter_id"]).sum())
+        dup_encounters = int(df["encounter_id"].duplicated().sum())
     else:
         dup_encounters = None
 
+    # identical rows share an encounter_id, so a unique key rules them out
+    # without hashing every column
+    if dup_encounters == 0:
+        dup_all_rows = 0
+    else:
+        dup_all_rows = int(df.duplicated().sum())
+
     return {
         "row_count": int(n_rows),
         "column_count": int(n_cols),
@@ -149,47 +232,24 @@ def validate_missing_and_duplicates(df):
     }
 
 
-def parse_age_range(age_str):
-    """Convert age like '[60-70)' into (60, 70), or (None, None) if invalid."""
-    if pd.isna(age_str):
-        return (None, None)
-    age_str = str(age_str).strip()
-    if not (age_str.startswith("[") and age_str.endswith(")") and "-" in age_str):
-        return (None, None)
-    inner = age_str[1:-1]
-    parts = inner.split("-")
-    if len(parts) != 2:
-        return (None, None)
-    try:
-        low = int(parts[0])
-        high = int(parts[1])
-        return (low, high)
-    except ValueError:
-        return (None, None)
-
-
 def validate_logical_constraints(df):
     issues = {}
 
     # --- age check ---
     if "age" in df.columns:
-        age_ranges = df["age"].dropna().apply(parse_age_range)
-        lows = [x[0] for x in age_ranges if x[0] is not None]
-        highs = [x[1] for x in age_ranges if x[1] is not None]
+        # age like '[60-70)' -> (60, 70); anything else is invalid
+        parts = df["age"].astype(STRING_DTYPE).str.strip().str.extract(r"^\[(\d+)-(\d+)\)$")
+        lows = pd.to_numeric(parts[0], errors="coerce")
+        highs = pd.to_numeric(parts[1], errors="coerce")
 
-        invalid_age_rows = df[
-            df["age"].notna()
-            & df["age"].apply(lambda x: parse_age_range(x)[0] is None)
-        ].shape[0]
+        invalid_age_rows = int(df["age"].notna().sum() - lows.notna().sum())
 
-        issues["age_min_observed"] = min(lows) if lows else None
-        issues["age_max_observed"] = max(highs) if highs else None
-        issues["age_invalid_rows"] = int(invalid_age_rows)
+        issues["age_min_observed"] = int(lows.min()) if lows.notna().any() else None
+        issues["age_max_observed"] = int(highs.max()) if highs.notna().any() else None
+        issues["age_invalid_rows"] = invalid_age_rows
 
         # check against 0–120 rule
-        issues["age_out_of_0_120"] = int(
-            sum((low < 0 or high > 120) for low, high in zip(lows, highs))
-        )
+        issues["age_out_of_0_120"] = int(((lows < 0) | (highs > 120)).sum())
 
     # --- time_in_hospital check ---
     if "time_in_hospital" in df.columns:
@@ -230,12 +290,31 @@ def run_validation(df, report_dir, report_name="data_quality_report.json"):
 # ----------------------------------------------------------------------
 # Transform helpers
 # ----------------------------------------------------------------------
-def clean_diag_code(series):
-    """Standardize diagnosis codes."""
-    s = series.astype("string").str.strip()
-    s = s.replace({"?": pd.NA, "": pd.NA})
-    s = s.str.upper()
-    return s
+def clean_diag_codes(frame):
+    """
+    Standardize diagnosis code columns in one pass over an Arrow table:
+    trim, upper-case, and turn "?" / "" into nulls.
+    """
+    table = pa.Table.from_pandas(frame.astype(STRING_DTYPE), preserve_index=False)
+    missing = pa.array(["?", ""])
+    for i, name in enumerate(table.column_names):
+        col = pc.utf8_upper(pc.utf8_trim_whitespace(table.column(i)))
+        col = pc.if_else(pc.is_in(col, value_set=missing), pa.scalar(None, pa.string()), col)
+        table = table.set_column(i, name, col)
+    cleaned = table.to_pandas(types_mapper={pa.string(): STRING_DTYPE}.get)
+    cleaned.index = frame.index
+    return cleaned
+
+
+def map_categories(series, func):
+    """
+    Apply a string transform to the distinct values of a column only and
+    broadcast the result back, instead of transforming every row.
+    """
+    s = series.astype("category")
+    categories = s.cat.categories
+    cleaned = func(pd.Series(categories, dtype=STRING_DTYPE))
+    return s.map(dict(zip(categories, cleaned))).astype(STRING_DTYPE)
 
 
 def standardize_med_status(series):
@@ -249,8 +328,7 @@ def standardize_med_status(series):
         "NA": pd.NA,
         "None": pd.NA,
     }
-    s = series.astype("string").str.strip()
-    return s.map(mapping).astype("string")
+    return map_categories(series, lambda s: s.str.strip().map(mapping))
 
 
 def encode_gender(df):
@@ -259,12 +337,12 @@ def encode_gender(df):
         "Female": "F",
         "Unknown/Invalid": "U",
     }
-    df["gender_clean"] = df["gender"].map(mapping).astype("string")
+    gender_clean = df["gender"].map(mapping).astype(STRING_DTYPE)
 
-    df["gender_female_flag"] = (
-        df["gender_clean"].map({"F": 1, "M": 0, "U": pd.NA})
+    gender_female_flag = (
+        gender_clean.map({"F": 1, "M": 0, "U": pd.NA})
     ).astype("Int64")
-    return df
+    return {"gender_clean": gender_clean, "gender_female_flag": gender_female_flag}
 
 
 def encode_race(df):
@@ -277,154 +355,111 @@ def encode_race(df):
         "?": pd.NA,
         "": pd.NA,
     }
-    df["race_clean"] = (
-        df["race"].astype("string").str.strip().map(race_map)
-    ).astype("string")
-    return df
+    race_clean = map_categories(
+        df["race"], lambda s: s.str.strip().map(race_map)
+    )
+    return {"race_clean": race_clean}
 
 
 def encode_readmitted(df):
-    s = df["readmitted"].astype("string").str.strip().str.upper()
-    df["readmitted_raw_clean"] = s
+    s = map_categories(df["readmitted"], lambda s: s.str.strip().str.upper())
 
-    df["readmitted_any_flag"] = s.replace(
-        {"NO": 0, "<30": 1, ">30": 1}
-    ).astype("Int64")
+    is_lt30 = s.eq("<30")
+    is_gt30 = s.eq(">30")
+    # anything other than NO / <30 / >30 stays missing
+    known = (s.eq("NO") | is_lt30 | is_gt30).fillna(False)
 
-    df["readmitted_30d_flag"] = s.replace(
-        {"NO": 0, "<30": 1, ">30": 0}
-    ).astype("Int64")
-
-    return df
+    return {
+        "readmitted_raw_clean": s,
+        "readmitted_any_flag": (is_lt30 | is_gt30).astype("Int64").where(known),
+        "readmitted_30d_flag": is_lt30.astype("Int64").where(known),
+    }
 
 
 # ----------------------------------------------------------------------
 # Transform main
 # ----------------------------------------------------------------------
 def transform_encounters(df_raw, admission_type_df, discharge_disp_df, admission_source_df):
-    df = df_raw.copy()
+    # Cast and derived columns are collected here and attached to the raw
+    # frame with a single assign() at the end.
+    cols = {}
 
     # 1) Basic numeric types
-    numeric_cols = [
-        "time_in_hospital",
-        "num_lab_procedures",
-        "num_procedures",
-        "num_medications",
-        "number_outpatient",
-        "number_emergency",
-        "number_inpatient",
-        "number_diagnoses",
-    ]
-    for col in numeric_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+    numeric = df_raw[list(NUMERIC_COLS)].apply(pd.to_numeric, errors="coerce")
+    cols.update(numeric.astype("Int64").items())
 
     # IDs as string
-    id_cols = [
-        "encounter_id",
-        "patient_nbr",
-        "admission_type_id",
-        "discharge_disposition_id",
-        "admission_source_id",
-    ]
-    for col in id_cols:
-        if col in df.columns:
-            df[col] = df[col].astype("string")
+    cols.update(df_raw[list(ID_COLS)].astype(STRING_DTYPE).items())
 
     # 2) Diagnosis codes
-    diag_cols = ["diag_1", "diag_2", "diag_3"]
-    for col in diag_cols:
-        if col in df.columns:
-            df[col + "_clean"] = clean_diag_code(df[col])
-
-    def diag_group(code):
-        if code is None or pd.isna(code):
-            return None
-        code = str(code)
-        # diabetes explicitly (ICD-9 250.xx)
-        if code.startswith("250"):
-            return "diabetes"
-        try:
-            match = re.match(r"(\d+(\.\d+)?)", code)
-            if not match:
-                return "other"
-            num = float(match.group(1))
-        except Exception:
-            return "other"
-        if 390 <= num <= 459:
-            return "circulatory"
-        if 460 <= num <= 519:
-            return "respiratory"
-        if 520 <= num <= 579:
-            return "digestive"
-        return "other"
-
-    df["diag_1_group"] = df["diag_1_clean"].apply(diag_group).astype("string")
+    diag_clean = clean_diag_codes(df_raw[list(DIAG_COLS)])
+    cols.update((c + "_clean", diag_clean[c]) for c in DIAG_COLS)
+
+    # Group diag_1 into broad ICD-9 chapters (diabetes explicitly = 250.xx)
+    code = cols["diag_1_clean"]
+    num = pd.to_numeric(
+        code.str.extract(r"^(\d+(?:\.\d+)?)", expand=False), errors="coerce"
+    ).to_numpy(dtype=float, na_value=np.nan)
+    group = np.select(
+        [
+            code.isna().to_numpy(),
+            code.str.startswith("250").fillna(False).to_numpy(dtype=bool),
+            (num >= 390) & (num <= 459),
+            (num >= 460) & (num <= 519),
+            (num >= 520) & (num <= 579),
+        ],
+        [None, "diabetes", "circulatory", "respiratory", "digestive"],
+        default="other",
+    )
+    cols["diag_1_group"] = pd.Series(
+        pd.array(group, dtype=STRING_DTYPE), index=df_raw.index
+    )
 
     # 3) Medications
-    med_cols = [
-        "metformin", "repaglinide", "nateglinide", "chlorpropamide",
-        "glimepiride", "acetohexamide", "glipizide", "glyburide",
-        "tolbutamide", "pioglitazone", "rosiglitazone", "acarbose",
-        "miglitol", "troglitazone", "tolazamide", "examide",
-        "citoglipton", "insulin", "glyburide-metformin",
-        "glipizide-metformin", "glimepiride-pioglitazone",
-        "metformin-rosiglitazone", "metformin-pioglitazone",
-    ]
-
-    active_flags = []
-    for col in med_cols:
-        if col in df.columns:
-            clean_col = col + "_clean"
-            df[clean_col] = standardize_med_status(df[col])
-            flag_col = clean_col + "_active_flag"
-            df[flag_col] = df[clean_col].map(
-                {"steady": 1, "increased": 1, "decreased": 1, "no": 0}
-            ).astype("Int64")
-            active_flags.append(flag_col)
+    cleaned = df_raw[list(MED_COLS)].apply(standardize_med_status)
+    # 1 = steady/increased/decreased, 0 = no, NA stays NA
+    flags = (
+        cleaned.isin(["steady", "increased", "decreased"])
+        .astype("Int64")
+        .mask(cleaned.isna())
+    )
+    for col in MED_COLS:
+        cols[col + "_clean"] = cleaned[col]
+        cols[col + "_clean_active_flag"] = flags[col]
 
-    if active_flags:
-        df["num_active_diabetes_meds"] = df[active_flags].sum(axis=1).astype("Int64")
+    active = flags.fillna(0).to_numpy(dtype=np.int8)
+    cols["num_active_diabetes_meds"] = pd.Series(
+        pd.array(active.sum(axis=1, dtype=np.int16), dtype="Int64"), index=df_raw.index
+    )
 
     # 4) Encode key attributes
-    df = encode_gender(df)
-    df = encode_race(df)
-    df = encode_readmitted(df)
+    cols.update(encode_gender(df_raw))
+    cols.update(encode_race(df_raw))
+    cols.update(encode_readmitted(df_raw))
 
     # Labs
-    lab_cols = ["A1Cresult", "max_glu_serum"]
-    for col in lab_cols:
-        if col in df.columns:
-            s = df[col].astype("string").str.strip()
-            s = s.replace({"None": pd.NA, "?": pd.NA, "": pd.NA})
-            df[col + "_clean"] = s
+    for col in LAB_COLS:
+        cols[col + "_clean"] = map_categories(
+            df_raw[col],
+            lambda s: s.str.strip().replace({"None": pd.NA, "?": pd.NA, "": pd.NA}),
+        )
 
     # 5) Join lookup tables
-    admission_type_df = admission_type_df.copy()
-    discharge_disp_df = discharge_disp_df.copy()
-    admission_source_df = admission_source_df.copy()
-
-    admission_type_df["admission_type_id"] = admission_type_df["admission_type_id"].astype("string")
-    discharge_disp_df["discharge_disposition_id"] = discharge_disp_df["discharge_disposition_id"].astype("string")
-    admission_source_df["admission_source_id"] = admission_source_df["admission_source_id"].astype("string")
-
-    if "description" in admission_type_df.columns:
-        admission_type_df = admission_type_df.rename(columns={"description": "admission_type_desc"})
-    if "description" in discharge_disp_df.columns:
-        discharge_disp_df = discharge_disp_df.rename(columns={"description": "discharge_disposition_desc"})
-    if "description" in admission_source_df.columns:
-        admission_source_df = admission_source_df.rename(columns={"description": "admission_source_desc"})
+    # lookups are tiny, so map each ID through a dict instead of merging
+    lookups = [
+        ("admission_type_id", "admission_type_desc", admission_type_df),
+        ("discharge_disposition_id", "discharge_disposition_desc", discharge_disp_df),
+        ("admission_source_id", "admission_source_desc", admission_source_df),
+    ]
+    for id_col, desc_col, lookup_df in lookups:
+        mapping = dict(zip(lookup_df[id_col].astype(STRING_DTYPE), lookup_df["description"]))
+        cols[desc_col] = df_raw[id_col].map(mapping).astype(STRING_DTYPE)
 
-    df = df.merge(admission_type_df, on="admission_type_id", how="left")
-    df = df.merge(discharge_disp_df, on="discharge_disposition_id", how="left")
-    df = df.merge(admission_source_df, on="admission_source_id", how="left")
+    df = df_raw.assign(**cols)
 
     # 6) Column naming consistency
-    def to_snake(name):
-        name = name.replace(" ", "_").replace("-", "_").replace("/", "_")
-        return name.lower()
-
-    df.columns = [to_snake(c) for c in df.columns]
+    to_snake = str.maketrans({" ": "_", "-": "_", "/": "_"})
+    df = df.rename(columns={c: c.translate(to_snake).lower() for c in df.columns})
 
     return df
 
@@ -433,64 +468,79 @@ def transform_encounters(df_raw, admission_type_df, discharge_disp_df, admission
 # Summary metrics
 # ----------------------------------------------------------------------
 def generate_summaries(df_silver, report_dir):
-    # Overall summary
-    df = df_silver.copy()
-    df["time_in_hospital_num"] = pd.to_numeric(df["time_in_hospital"], errors="coerce")
-    df["num_medications_num"] = pd.to_numeric(df["num_medications"], errors="coerce")
-    readmitted_upper = df["readmitted"].str.upper().str.strip()
+    # One narrow frame with the hot columns, shared by all summaries
+    readm = df_silver["readmitted"].str.strip().str.upper()
+    work = df_silver[["encounter_id", "patient_nbr", "age", "insulin", "race", "gender"]].assign(
+        readm_any=readm.ne("NO"),
+        readm_30=readm.eq("<30"),
+        tih=pd.to_numeric(df_silver["time_in_hospital"], errors="coerce"),
+        nm=pd.to_numeric(df_silver["num_medications"], errors="coerce"),
+    )
+
+    def grouped(keys, **aggs):
+        return (
+            work.groupby(keys, dropna=False, observed=True, sort=False)
+            .agg(**aggs)
+            .reset_index()
+            .sort_values(keys)
+        )
 
+    # Overall summary
     summary_overall = pd.DataFrame([{
-        "n_encounters": len(df),
-        "n_unique_patients": df["patient_nbr"].nunique(),
-        "mean_length_of_stay_days": df["time_in_hospital_num"].mean(),
-        "median_length_of_stay_days": df["time_in_hospital_num"].median(),
-        "mean_num_medications": df["num_medications_num"].mean(),
-        "readmission_rate_any": (readmitted_upper != "NO").mean(),
-        "readmission_rate_30d": (readmitted_upper == "<30").mean(),
+        "n_encounters": len(work),
+        "n_unique_patients": work["patient_nbr"].nunique(),
+        "mean_length_of_stay_days": work["tih"].mean(),
+        "median_length_of_stay_days": work["tih"].median(),
+        "mean_num_medications": work["nm"].mean(),
+        "readmission_rate_any": work["readm_any"].mean(),
+        "readmission_rate_30d": work["readm_30"].mean(),
     }])
     summary_overall.to_csv(report_dir / "summary_overall_metrics.csv", index=False)
 
     # Readmission by age
-    df_age = df_silver.copy()
-    df_age["readmitted_any"] = df_age["readmitted"].str.upper().str.strip().ne("NO")
-    readmission_by_age = (
-        df_age.groupby("age", dropna=False)["readmitted_any"]
-        .agg(["count", "mean"])
-        .reset_index()
-        .rename(columns={"count": "n_encounters", "mean": "readmission_rate"})
-        .sort_values("age")
+    readmission_by_age = grouped(
+        "age",
+        n_encounters=("readm_any", "count"),
+        readmission_rate=("readm_any", "mean"),
     )
     readmission_by_age.to_csv(report_dir / "readmission_by_age.csv", index=False)
 
     # Readmission by insulin
-    df_ins = df_silver.copy()
-    df_ins["readmitted_any"] = df_ins["readmitted"].str.upper().str.strip().ne("NO")
-    insulin_readmission = (
-        df_ins.groupby("insulin", dropna=False)["readmitted_any"]
-        .agg(["count", "mean"])
-        .reset_index()
-        .rename(columns={"count": "n_encounters", "mean": "readmission_rate"})
-        .sort_values("insulin")
+    insulin_readmission = grouped(
+        "insulin",
+        n_encounters=("readm_any", "count"),
+        readmission_rate=("readm_any", "mean"),
     )
     insulin_readmission.to_csv(report_dir / "readmission_by_insulin.csv", index=False)
 
     # Race & gender
-    df_rg = df_silver.copy()
-    df_rg["time_in_hospital_num"] = pd.to_numeric(df_rg["time_in_hospital"], errors="coerce")
-    df_rg["readmitted_any"] = df_rg["readmitted"].str.upper().str.strip().ne("NO")
-    race_gender_summary = (
-        df_rg.groupby(["race", "gender"], dropna=False)
-        .agg(
-            n_encounters=("encounter_id", "count"),
-            mean_los_days=("time_in_hospital_num", "mean"),
-            readmission_rate=("readmitted_any", "mean"),
-        )
-        .reset_index()
-        .sort_values(["race", "gender"])
+    race_gender_summary = grouped(
+        ["race", "gender"],
+        n_encounters=("encounter_id", "count"),
+        mean_los_days=("tih", "mean"),
+        readmission_rate=("readm_any", "mean"),
     )
     race_gender_summary.to_csv(report_dir / "race_gender_summary.csv", index=False)
 
 
+# ----------------------------------------------------------------------
+# Exports
+# ----------------------------------------------------------------------
+def make_silver_csv(
+    feather_path=SILVER_DIR / "diabetic_encounters_silver.feather",
+    csv_path=SILVER_DIR / "diabetic_encounters_silver.csv",
+):
+    """Write the silver table as CSV on demand, from the Feather sidecar."""
+    table = feather.read_table(feather_path)
+    pacsv.write_csv(
+        table,
+        csv_path,
+        write_options=pacsv.WriteOptions(quoting_style="needed"),
+    )
+    logging.info("Silver CSV written to %s", csv_path)
+    return csv_path
+
+
 # ----------------------------------------------------------------------
 # Main
 # ----------------------------------------------------------------------
@@ -499,7 +549,10 @@ def main():
     df_raw, ingestion_report = ingest_main_encounters(MAIN_CSV_PATH)
 
     bronze_main_path = BRONZE_DIR / "diabetic_encounters_bronze.parquet"
-    df_raw.to_parquet(bronze_main_path, index=False)
+    # Nothing in this run reads the bronze file back, so write it in the
+    # background while validation and the transform use df_raw in memory.
+    bronze_executor = ThreadPoolExecutor(max_workers=1)
+    bronze_write = bronze_executor.submit(df_raw.to_parquet, bronze_main_path, index=False)
 
     ingestion_report_path = DQ_REPORT_DIR / "ingestion_report.json"
     with open(ingestion_report_path, "w") as f:
@@ -515,16 +568,17 @@ def main():
     df_silver = transform_encounters(df_raw, admission_type_df, discharge_disp_df, admission_source_df)
 
     silver_parquet_path = SILVER_DIR / "diabetic_encounters_silver.parquet"
-    silver_csv_path = SILVER_DIR / "diabetic_encounters_silver.csv"
+    silver_feather_path = SILVER_DIR / "diabetic_encounters_silver.feather"
 
-    df_silver.to_parquet(silver_parquet_path, index=False)
-    df_silver.to_csv(silver_csv_path, index=False)
+    df_silver.to_parquet(silver_parquet_path, engine="pyarrow", compression="zstd", index=False)
+    # Feather (Arrow IPC) sidecar for quick inspection; CSV via `make_csv`
+    df_silver.to_feather(silver_feather_path, compression="zstd")
 
     silver_report = {
         "rows": int(df_silver.shape[0]),
         "columns": int(df_silver.shape[1]),
         "parquet_path": str(silver_parquet_path),
-        "csv_path": str(silver_csv_path),
+        "feather_path": str(silver_feather_path),
     }
     with open(REPORT_DIR / "silver_export_report.json", "w") as f:
         json.dump(silver_report, f, indent=2)
@@ -532,8 +586,24 @@ def main():
     # 5) Healthcare summary tables
     generate_summaries(df_silver, REPORT_DIR)
 
+    bronze_write.result()
+    bronze_executor.shutdown()
+
     logging.info("Pipeline finished successfully.")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="AGEL diabetes encounters pipeline")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["run", "make_csv"],
+        default="run",
+        help="run the full pipeline (default) or export the silver table as CSV",
+    )
+    args = parser.parse_args()
+
+    if args.command == "make_csv":
+        make_silver_csv()
+    else:
+        main()